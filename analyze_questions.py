@@ -1,9 +1,15 @@
 import pandas as pd
+import re
 import sys
 
+from survey_data import first_distinct, load_survey
+
 sys.stdout.reconfigure(encoding='utf-8')
 
-df = pd.read_excel('jovana.xlsx')
+df = load_survey('jovana.xlsx')
+
+# Rating scale labels spell out both ends of the scale: "1 = ... 5 = ..."
+RATING_RE = re.compile(r'(?=.*1 =)(?=.*5 =)', re.DOTALL)
 
 print("SURVEY ANALYSIS")
 print("="*50)
@@ -15,14 +21,19 @@ yes_no_questions = []
 numerical_questions = []
 text_questions = []
 
-for i, col in enumerate(df.columns[1:], 1):  # Skip timestamp
-    unique_values = df[col].nunique()
-    sample_values = df[col].dropna().unique()[:5]
+# Profile every question in one pass instead of scanning column by column
+questions = df.iloc[:, 1:]  # Skip timestamp
+unique_counts = questions.nunique()
+head = questions.head(500)
+
+for i, col in enumerate(questions.columns, 1):
+    unique_values = unique_counts[col]
+    sample_values = first_distinct(head[col])
     
     question_type = "Unknown"
     
     # Check for rating scales
-    if any("1 =" in str(val) and "5 =" in str(val) for val in sample_values):
+    if any(isinstance(val, str) and RATING_RE.match(val) for val in sample_values):
         rating_questions.append((i, col, unique_values, sample_values))
         question_type = "Rating Scale"
     # Check for yes/no questions
@@ -1,11 +1,12 @@
-import pandas as pd
 import sys
 
+from survey_data import load_survey
+
 # Set encoding to handle Serbian characters
 sys.stdout.reconfigure(encoding='utf-8')
 
 # Load the data
-df = pd.read_excel('jovana.xlsx')
+df = load_survey('jovana.xlsx')
 
 print(f"Dataset shape: {df.shape[0]} rows, {df.shape[1]} columns")
 print("\nFirst 15 column names:")
@@ -1,45 +1,61 @@
-import pandas as pd
 import sys
 
+from survey_data import first_distinct, load_survey, survey_columns
+
 sys.stdout.reconfigure(encoding='utf-8')
-df = pd.read_excel('jovana.xlsx')
+columns = survey_columns('jovana.xlsx')
+lowered_columns = columns.str.lower()
+
+
+def find_columns(pattern):
+    """Return columns whose header matches any of the |-separated lowercase keywords"""
+    return columns[lowered_columns.str.contains(pattern, regex=True, na=False)]
+
+
+# Match headers first so only the relevant columns are loaded from the Parquet cache
+education_cols = find_columns('obrazovan')
+satisfaction_cols = find_columns('iskustvo|oceni|zadovoljn')
+mental_health_cols = find_columns('tuga|anksioznost|strah|depresij|emocij|psiholog|mental')
+desire_cols = find_columns('želiš|planir|buduć|još|deca')
+support_cols = find_columns('podrška|pomoć|partner|porodic|prijatelj')
+
+matched_cols = dict.fromkeys(
+    list(education_cols) + list(satisfaction_cols) + list(mental_health_cols)
+    + list(desire_cols) + list(support_cols[:5])
+)
+df = load_survey('jovana.xlsx', columns=list(matched_cols))
 
 print("FINDING KEY RELATIONSHIP VARIABLES")
 print("="*50)
 
-# Find education question
-education_cols = [col for col in df.columns if 'obrazovan' in col.lower()]
+# Education questions
 print("EDUCATION QUESTIONS:")
 for col in education_cols:
     print(f"- {col}")
-    print(f"  Values: {df[col].unique()[:5]}")
+    print(f"  Values: {first_distinct(df[col], 5)}")
 
-# Find birth satisfaction questions
-satisfaction_cols = [col for col in df.columns if any(word in col.lower() for word in ['iskustvo', 'oceni', 'zadovoljn'])]
+# Birth satisfaction questions
 print(f"\nBIRTH SATISFACTION QUESTIONS:")
 for col in satisfaction_cols:
     print(f"- {col}")
-    print(f"  Values: {df[col].unique()[:5]}")
+    print(f"  Values: {first_distinct(df[col], 5)}")
 
-# Find mental health related questions
-mental_health_cols = [col for col in df.columns if any(word in col.lower() for word in ['tuga', 'anksioznost', 'strah', 'depresij', 'emocij', 'psiholog', 'mental'])]
+# Mental health related questions
 print(f"\nMENTAL HEALTH QUESTIONS:")
 for col in mental_health_cols:
     print(f"- {col}")
-    print(f"  Values: {df[col].unique()[:3]}")
+    print(f"  Values: {first_distinct(df[col], 3)}")
 
-# Find desire for more children questions
-desire_cols = [col for col in df.columns if any(word in col.lower() for word in ['želiš', 'planir', 'buduć', 'još', 'deca'])]
+# Desire for more children questions
 print(f"\nDESIRE FOR MORE CHILDREN QUESTIONS:")
 for col in desire_cols:
     print(f"- {col}")
-    print(f"  Values: {df[col].unique()[:3]}")
+    print(f"  Values: {first_distinct(df[col], 3)}")
 
-# Find support system questions  
-support_cols = [col for col in df.columns if any(word in col.lower() for word in ['podrška', 'pomoć', 'partner', 'porodic', 'prijatelj'])]
+# Support system questions  
 print(f"\nSUPPORT SYSTEM QUESTIONS:")
 for col in support_cols[:5]:  # Show first 5
     print(f"- {col}")
-    print(f"  Values: {df[col].unique()[:3]}")
+    print(f"  Values: {first_distinct(df[col], 3)}")
 
-print(f"\nTOTAL COLUMNS ANALYZED: {len(df.columns)}")
\ No newline at end of file
+print(f"\nTOTAL COLUMNS ANALYZED: {len(columns)}")
@@ -1,14 +1,16 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
-from collections import Counter
 import re
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 from io import BytesIO
+import threading
+
+from survey_data import first_distinct
+
+# Rating scale anchors such as "1 = ..." or "5 = ..."
+_RATING_RE = re.compile(r'[15] =')
+# Word tokens for the text analysis word clouds
+_WORD_RE = re.compile(r'\w+')
 
 # Page configuration
 st.set_page_config(
@@ -34,6 +36,213 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def _csv_bytes(df):
+    """Encode the data as UTF-8 CSV bytes for download"""
+    buf = BytesIO()
+    df.to_csv(buf, index=False, encoding='utf-8')
+    return buf.getvalue()
+
+
+@st.cache_resource(show_spinner=False, max_entries=4, ttl="1h")
+def get_analyzer(file_bytes):
+    """Parse the upload and build the categorized analyzer once per distinct upload"""
+    # Convert after the read so mixed-type columns stay object instead of raising ArrowInvalid
+    return SurveyAnalyzer(pd.read_excel(BytesIO(file_bytes)).convert_dtypes(dtype_backend='pyarrow'))
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _demographics_charts(df):
+    """Create demographic overview charts"""
+    import plotly.express as px
+
+    charts = []
+    # Count the four demographic columns once, up front
+    counts = {col: df[col].value_counts() for col in df.columns[1:5]}
+
+    # Location distribution
+    if len(df.columns) > 1:
+        location_col = df.columns[1]  # "Gde živiš?"
+        location_counts = counts[location_col]
+
+        fig_location = px.pie(
+            values=location_counts.values,
+            names=location_counts.index,
+            title="Distribution by Location Type"
+        )
+        charts.append(("Location Distribution", fig_location))
+
+    # Region distribution
+    if len(df.columns) > 2:
+        region_col = df.columns[2]  # "U kom kraju zemlje živiš?"
+        region_counts = counts[region_col]
+
+        fig_region = px.bar(
+            x=region_counts.index,
+            y=region_counts.values,
+            title="Distribution by Region",
+            labels={'x': 'Region', 'y': 'Count'}
+        )
+        fig_region.update_xaxis(tickangle=45)
+        charts.append(("Region Distribution", fig_region))
+
+    # Age distribution
+    if len(df.columns) > 3:
+        age_col = df.columns[3]  # Age when became mother
+        age_counts = counts[age_col]
+
+        fig_age = px.bar(
+            x=age_counts.values,
+            y=age_counts.index,
+            orientation='h',
+            title="Age When Became Mother",
+            labels={'x': 'Count', 'y': 'Age Group'}
+        )
+        charts.append(("Age Distribution", fig_age))
+
+    # Education level
+    if len(df.columns) > 4:
+        edu_col = df.columns[4]  # Education level
+        edu_counts = counts[edu_col]
+
+        fig_edu = px.pie(
+            values=edu_counts.values,
+            names=edu_counts.index,
+            title="Education Level Distribution"
+        )
+        charts.append(("Education Distribution", fig_edu))
+
+    return charts
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _experience_charts(df):
+    """Create birth/pregnancy experience charts"""
+    import plotly.express as px
+
+    charts = []
+
+    # Find birth method question
+    birth_cols = [col for col in df.columns if 'porodila' in col.lower()]
+    if birth_cols:
+        birth_counts = df[birth_cols[0]].value_counts()
+        fig_birth = px.pie(
+            values=birth_counts.values,
+            names=birth_counts.index,
+            title="Birth Method Distribution"
+        )
+        charts.append(("Birth Method", fig_birth))
+
+    # Find birth experience rating
+    rating_cols = [col for col in df.columns if 'iskustvo porođaja' in col.lower()]
+    if rating_cols:
+        rating_counts = df[rating_cols[0]].value_counts()
+        fig_rating = px.bar(
+            x=rating_counts.index,
+            y=rating_counts.values,
+            title="Birth Experience Rating (1=Very Bad, 5=Excellent)",
+            labels={'x': 'Rating', 'y': 'Count'}
+        )
+        charts.append(("Birth Experience Rating", fig_rating))
+
+    # Planned pregnancy
+    planned_cols = [col for col in df.columns if 'planirana' in col.lower()]
+    if planned_cols:
+        planned_counts = df[planned_cols[0]].value_counts()
+        fig_planned = px.pie(
+            values=planned_counts.values,
+            names=planned_counts.index,
+            title="Was Pregnancy Planned?"
+        )
+        charts.append(("Pregnancy Planning", fig_planned))
+
+    return charts
+
+
+def _crosstab_counts(s1, s2):
+    """Count co-occurrences of two categorical series via their integer codes"""
+    if not isinstance(s1.dtype, pd.CategoricalDtype):
+        s1 = s1.astype('category')
+    if not isinstance(s2.dtype, pd.CategoricalDtype):
+        s2 = s2.astype('category')
+
+    codes1 = s1.cat.codes.to_numpy().astype(np.int64)
+    codes2 = s2.cat.codes.to_numpy().astype(np.int64)
+    n1, n2 = len(s1.cat.categories), len(s2.cat.categories)
+
+    # Missing values have code -1 and are left out, as in pd.crosstab
+    valid = (codes1 >= 0) & (codes2 >= 0)
+    counts = np.bincount(codes1[valid] * n2 + codes2[valid], minlength=n1 * n2).reshape(n1, n2)
+
+    # Drop categories that never co-occur with a non-missing answer
+    row_mask = counts.sum(axis=1) > 0
+    col_mask = counts.sum(axis=0) > 0
+    return counts[row_mask][:, col_mask], s1.cat.categories[row_mask], s2.cat.categories[col_mask]
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cross_analysis(df, var1, var2):
+    """Create cross-tabulation analysis"""
+    import plotly.express as px
+
+    if var1 and var2 and var1 != var2:
+        counts, rows, cols = _crosstab_counts(df[var1], df[var2])
+
+        fig = px.imshow(
+            counts,
+            x=cols,
+            y=rows,
+            aspect="auto",
+            color_continuous_scale="Blues",
+            title=f"Cross-analysis: {var1} vs {var2}"
+        )
+        fig.update_xaxis(tickangle=45)
+        fig.update_yaxis(tickangle=0)
+
+        return fig
+    return None
+
+
+@st.cache_resource(show_spinner=False)
+def _wordcloud_canvas():
+    """Create the figure reused for every word cloud, shared across reruns and sessions"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    return fig, ax, threading.Lock()
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _wordcloud_png(texts, title):
+    """Render a word cloud of the given responses as PNG bytes"""
+    from wordcloud import WordCloud
+
+    # Count words up front so WordCloud skips its own tokenizer pass
+    tokens = texts.astype(str).str.lower().str.findall(_WORD_RE).explode().dropna()
+    freqs = tokens[~tokens.str.isdigit()].value_counts().to_dict()
+
+    wordcloud = WordCloud(
+        width=800,
+        height=400,
+        background_color='white',
+        max_words=100,
+        colormap='viridis'
+    ).generate_from_frequencies(freqs)
+
+    # Convert to bytes
+    img_buffer = BytesIO()
+    fig, ax, lock = _wordcloud_canvas()
+    with lock:
+        ax.clear()
+        ax.imshow(wordcloud, interpolation='bilinear')
+        ax.axis('off')
+        ax.set_title(f"Word Cloud: {title}", fontsize=16, pad=20)
+        fig.savefig(img_buffer, format='png', bbox_inches='tight')
+
+    return img_buffer.getvalue()
+
 
 class SurveyAnalyzer:
     def __init__(self, df):
@@ -43,18 +252,38 @@ class SurveyAnalyzer:
         self.text_questions = []
         self.rating_questions = []
         self._categorize_questions()
-    
+
+        # Low-cardinality answers are stored as category codes for faster counting
+        for col in self.categorical_questions + self.yes_no_questions + self.rating_questions:
+            # Mixed-type columns stay object; their categories could not be sent to Arrow for display.
+            # Columns with no answers are skipped: a null[pyarrow] column can't hold categories.
+            if self.df[col].dtype != object and self.df[col].count() > 0:
+                self.df[col] = self.df[col].astype('category')
+
+        # Variables offered in the cross-analysis selectboxes
+        self.cross_options = tuple(self.categorical_questions + self.yes_no_questions)
+
     def _categorize_questions(self):
         """Categorize questions by type"""
-        for col in self.df.columns[1:]:  # Skip timestamp
-            unique_count = self.df[col].nunique()
-            sample_values = self.df[col].dropna().unique()[:5]
-            
+        questions = self.df.iloc[:, 1:]  # Skip timestamp
+        # Classify from the first rows; the type of a question settles long before the end
+        head = questions.head(1000)
+        unique_counts = head.nunique()
+        if len(questions) > len(head):
+            # The sample can under-count, so recount the columns that might fall under the cut-offs
+            low = unique_counts.index[unique_counts <= 10]
+            unique_counts[low] = questions[low].nunique()
+        samples = {col: first_distinct(head[col]) for col in head.columns}
+
+        for col in questions.columns:
+            unique_count = unique_counts[col]
+            sample_values = samples[col]
+
             # Rating scales (look for patterns like "1 = ... 5 =")
-            if any("1 =" in str(val) or "5 =" in str(val) for val in sample_values):
+            if any(isinstance(val, str) and _RATING_RE.search(val) for val in sample_values):
                 self.rating_questions.append(col)
-            # Yes/No questions
-            elif unique_count <= 3 and any(str(val) in ['Da', 'Ne'] for val in sample_values):
+            # Yes/No questions (at most 3 answers, so check every one of them)
+            elif unique_count <= 3 and any(str(val) in ['Da', 'Ne'] for val in questions[col].dropna().unique()):
                 self.yes_no_questions.append(col)
             # Categorical (reasonable number of categories)
             elif unique_count <= 10:
@@ -65,122 +294,16 @@ class SurveyAnalyzer:
     
     def create_demographics_charts(self):
         """Create demographic overview charts"""
-        charts = []
-        
-        # Location distribution
-        if len(self.df.columns) > 1:
-            location_col = self.df.columns[1]  # "Gde živiš?"
-            location_counts = self.df[location_col].value_counts()
-            
-            fig_location = px.pie(
-                values=location_counts.values,
-                names=location_counts.index,
-                title="Distribution by Location Type"
-            )
-            charts.append(("Location Distribution", fig_location))
-        
-        # Region distribution
-        if len(self.df.columns) > 2:
-            region_col = self.df.columns[2]  # "U kom kraju zemlje živiš?"
-            region_counts = self.df[region_col].value_counts()
-            
-            fig_region = px.bar(
-                x=region_counts.index,
-                y=region_counts.values,
-                title="Distribution by Region",
-                labels={'x': 'Region', 'y': 'Count'}
-            )
-            fig_region.update_xaxis(tickangle=45)
-            charts.append(("Region Distribution", fig_region))
-        
-        # Age distribution
-        if len(self.df.columns) > 3:
-            age_col = self.df.columns[3]  # Age when became mother
-            age_counts = self.df[age_col].value_counts()
-            
-            fig_age = px.bar(
-                x=age_counts.values,
-                y=age_counts.index,
-                orientation='h',
-                title="Age When Became Mother",
-                labels={'x': 'Count', 'y': 'Age Group'}
-            )
-            charts.append(("Age Distribution", fig_age))
-        
-        # Education level
-        if len(self.df.columns) > 4:
-            edu_col = self.df.columns[4]  # Education level
-            edu_counts = self.df[edu_col].value_counts()
-            
-            fig_edu = px.pie(
-                values=edu_counts.values,
-                names=edu_counts.index,
-                title="Education Level Distribution"
-            )
-            charts.append(("Education Distribution", fig_edu))
-        
-        return charts
-    
+        return _demographics_charts(self.df)
+
     def create_experience_charts(self):
         """Create birth/pregnancy experience charts"""
-        charts = []
-        
-        # Find birth method question
-        birth_cols = [col for col in self.df.columns if 'porodila' in col.lower()]
-        if birth_cols:
-            birth_counts = self.df[birth_cols[0]].value_counts()
-            fig_birth = px.pie(
-                values=birth_counts.values,
-                names=birth_counts.index,
-                title="Birth Method Distribution"
-            )
-            charts.append(("Birth Method", fig_birth))
-        
-        # Find birth experience rating
-        rating_cols = [col for col in self.df.columns if 'iskustvo porođaja' in col.lower()]
-        if rating_cols:
-            rating_counts = self.df[rating_cols[0]].value_counts()
-            fig_rating = px.bar(
-                x=rating_counts.index,
-                y=rating_counts.values,
-                title="Birth Experience Rating (1=Very Bad, 5=Excellent)",
-                labels={'x': 'Rating', 'y': 'Count'}
-            )
-            charts.append(("Birth Experience Rating", fig_rating))
-        
-        # Planned pregnancy
-        planned_cols = [col for col in self.df.columns if 'planirana' in col.lower()]
-        if planned_cols:
-            planned_counts = self.df[planned_cols[0]].value_counts()
-            fig_planned = px.pie(
-                values=planned_counts.values,
-                names=planned_counts.index,
-                title="Was Pregnancy Planned?"
-            )
-            charts.append(("Pregnancy Planning", fig_planned))
-        
-        return charts
-    
+        return _experience_charts(self.df)
+
     def create_cross_analysis(self, var1, var2):
         """Create cross-tabulation analysis"""
-        if var1 and var2 and var1 != var2:
-            cross_tab = pd.crosstab(self.df[var1], self.df[var2], margins=True)
-            cross_tab = cross_tab.iloc[:-1, :-1]  # Remove margins
-            
-            fig = px.imshow(
-                cross_tab.values,
-                x=cross_tab.columns,
-                y=cross_tab.index,
-                aspect="auto",
-                color_continuous_scale="Blues",
-                title=f"Cross-analysis: {var1} vs {var2}"
-            )
-            fig.update_xaxis(tickangle=45)
-            fig.update_yaxis(tickangle=0)
-            
-            return fig
-        return None
-    
+        return _cross_analysis(self.df, var1, var2)
+
     def analyze_text_responses(self, text_column):
         """Analyze text responses"""
         text_data = self.df[text_column].dropna()
@@ -188,36 +311,10 @@ class SurveyAnalyzer:
         if len(text_data) == 0:
             return None, None
         
-        # Combine all text
-        all_text = " ".join(text_data.astype(str))
-        
-        # Clean text for word cloud
-        cleaned_text = re.sub(r'[^\w\s]', ' ', all_text.lower())
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
-        
         # Generate word cloud
         try:
-            wordcloud = WordCloud(
-                width=800, 
-                height=400, 
-                background_color='white',
-                max_words=100,
-                colormap='viridis'
-            ).generate(cleaned_text)
-            
-            # Convert to image
-            fig, ax = plt.subplots(figsize=(10, 5))
-            ax.imshow(wordcloud, interpolation='bilinear')
-            ax.axis('off')
-            ax.set_title(f"Word Cloud: {text_column}", fontsize=16, pad=20)
-            
-            # Convert to bytes
-            img_buffer = BytesIO()
-            plt.savefig(img_buffer, format='png', bbox_inches='tight')
-            img_buffer.seek(0)
-            plt.close()
-            
-            return img_buffer, len(text_data)
+            wordcloud_img = _wordcloud_png(text_data, text_column)
+            return wordcloud_img, len(text_data)
         except:
             return None, len(text_data)
 
@@ -238,10 +335,8 @@ def main():
         try:
             # Load data
             with st.spinner("Loading data..."):
-                df = pd.read_excel(uploaded_file)
-            
-            # Initialize analyzer
-            analyzer = SurveyAnalyzer(df)
+                analyzer = get_analyzer(uploaded_file.getvalue())
+            df = analyzer.df
             
             # Display basic info
             col1, col2, col3, col4 = st.columns(4)
@@ -295,13 +390,13 @@ def main():
                 with col1:
                     var1 = st.selectbox(
                         "Select first variable:",
-                        options=analyzer.categorical_questions + analyzer.yes_no_questions,
+                        options=analyzer.cross_options,
                         key="var1"
                     )
                 with col2:
                     var2 = st.selectbox(
                         "Select second variable:",
-                        options=analyzer.categorical_questions + analyzer.yes_no_questions,
+                        options=analyzer.cross_options,
                         key="var2"
                     )
                 
@@ -347,10 +442,9 @@ def main():
                 st.info(f"Showing first 100 rows of {len(df)} total")
                 
                 # Download button
-                csv = df.to_csv(index=False).encode('utf-8')
                 st.download_button(
                     label="Download full data as CSV",
-                    data=csv,
+                    data=_csv_bytes(df),
                     file_name='survey_data.csv',
                     mime='text/csv'
                 )
@@ -1,16 +1,11 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
-from collections import Counter
 import re
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 from io import BytesIO
-from scipy.stats import chi2_contingency, fisher_exact
-import seaborn as sns
+from scipy.stats import chi2 as chi2_distribution
+import functools
 
 # Page configuration
 st.set_page_config(
@@ -43,45 +38,281 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Leading phrase of every key question matched in _identify_key_questions
+_KEY_QUESTION_RE = re.compile(
+    r'obrazovan|iskustvo porođaja|još dece|partner razume|'
+    r'anksioznosti, straha|postporođajne depresije|emocijama i teškoćama',
+    re.IGNORECASE
+)
+
+
+def _load_survey(file_bytes, name):
+    """Parse an uploaded survey file into compact Arrow, numeric and category dtypes"""
+    if name.endswith('.csv'):
+        df = pd.read_csv(BytesIO(file_bytes), encoding='utf-8', dtype_backend='pyarrow')
+    else:
+        try:
+            # The Rust calamine reader parses xlsx far faster than openpyxl
+            df = pd.read_excel(BytesIO(file_bytes), sheet_name=0, engine='calamine')
+        except ImportError:
+            df = pd.read_excel(BytesIO(file_bytes), sheet_name=0, engine='openpyxl')
+        # Convert after the read so mixed-type columns stay object instead of raising ArrowInvalid
+        df = df.convert_dtypes(dtype_backend='pyarrow')
+    
+    # Scale answers (1-5 and similar) fit in the smallest numeric type
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in df.select_dtypes(include='float').columns:
+        downcast = pd.to_numeric(df[col], downcast='float')
+        # float32 would turn answers like 1.1 into 1.100000023841858, so only keep exact round-trips
+        if downcast.astype(df[col].dtype).equals(df[col]):
+            df[col] = downcast
+    
+    # Repeated string answers are stored as category codes for faster crosstabs and counts
+    unique_counts = df.nunique()
+    for col in df.columns:
+        if pd.api.types.is_string_dtype(df[col].dtype) and 0 < unique_counts[col] < len(df) // 2:
+            df[col] = df[col].astype('category')
+    
+    return df
+
+
+# Long crosstabs are cut to their most answered rows before being sent to the browser
+_MAX_CROSSTAB_ROWS = 25
+
+
+def _show_crosstab(cross_tab, **kwargs):
+    """Display a crosstab of counts, keeping only the most answered rows of very long tables"""
+    n_rows = len(cross_tab)
+    if n_rows > _MAX_CROSSTAB_ROWS:
+        top_rows = cross_tab.sum(axis=1).nlargest(_MAX_CROSSTAB_ROWS).index
+        cross_tab = cross_tab[cross_tab.index.isin(top_rows)]
+        st.caption(f"Showing the {_MAX_CROSSTAB_ROWS} most common of {n_rows} answers")
+    st.dataframe(cross_tab, **kwargs)
+
+
+def _row_percentages(cross_tab):
+    """Convert crosstab counts to percentages within each row"""
+    return cross_tab.div(cross_tab.sum(axis=1).replace(0, np.nan), axis=0) * 100
+
+
+def _long_percentages(cross_tab_pct):
+    """Reshape a percentage crosstab to one (row, column, pct) record per cell for px.bar"""
+    n_rows, n_cols = cross_tab_pct.shape
+    return pd.DataFrame({
+        cross_tab_pct.index.name: cross_tab_pct.index.repeat(n_cols),
+        cross_tab_pct.columns.name: np.tile(cross_tab_pct.columns.to_numpy(), n_rows),
+        'pct': cross_tab_pct.to_numpy().ravel(),
+    })
+
+
+def _chi2_test(cross_tab):
+    """Chi-square test of independence on a crosstab of counts, matching chi2_contingency"""
+    observed = cross_tab.to_numpy(dtype=np.float64)
+    expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / observed.sum()
+    dof = (observed.shape[0] - 1) * (observed.shape[1] - 1)
+    
+    if dof == 0:
+        return 0.0, 1.0
+    if dof == 1:
+        # Yates' continuity correction for 2x2 tables, as chi2_contingency applies by default
+        diff = expected - observed
+        observed = observed + np.sign(diff) * np.minimum(0.5, np.abs(diff))
+    
+    chi2 = float(np.sum((observed - expected) ** 2 / expected))
+    return chi2, float(chi2_distribution.sf(chi2, dof))
+
+
+def _interpret_p_value(p_value):
+    """Interpret statistical significance"""
+    if p_value is None:
+        return "Cannot calculate statistical significance"
+    elif p_value < 0.001:
+        return "Very strong statistical relationship (p < 0.001)"
+    elif p_value < 0.01:
+        return "Strong statistical relationship (p < 0.01)"
+    elif p_value < 0.05:
+        return "Statistically significant relationship (p < 0.05)"
+    elif p_value < 0.1:
+        return "Marginally significant trend (p < 0.1)"
+    else:
+        return "No significant statistical relationship found"
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _education_vs_satisfaction(df, edu_col, sat_col):
+    """Analyze relationship between education and birth satisfaction"""
+    # Create crosstab (margins are kept for the detailed breakdown table)
+    cross_tab = pd.crosstab(df[edu_col], df[sat_col], margins=True)
+    counts = cross_tab.iloc[:-1, :-1]  # Remove margins
+    cross_tab_pct = _row_percentages(counts)
+    
+    # Create visualization
+    fig = px.imshow(
+        cross_tab_pct.values,
+        x=cross_tab_pct.columns,
+        y=cross_tab_pct.index,
+        color_continuous_scale="RdYlBu_r",
+        title="Education Level vs Birth Satisfaction (% within education group)",
+        labels=dict(color="Percentage")
+    )
+    fig.update_layout(height=500)
+    
+    # Calculate statistics
+    chi2, p_value = _chi2_test(counts)
+    
+    return {
+        'figure': fig,
+        'crosstab': cross_tab,
+        'chi2': chi2,
+        'p_value': p_value,
+        'interpretation': _interpret_p_value(p_value)
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _mental_health_vs_future_children(df, mh_col, fc_col):
+    """Analyze relationship between mental health and desire for more children"""
+    # Clean and prepare data
+    df_clean = df[[mh_col, fc_col]].dropna()
+    
+    if len(df_clean) < 10:
+        return None
+    
+    # Create stacked bar chart
+    cross_tab = pd.crosstab(df_clean[mh_col], df_clean[fc_col])
+    cross_tab_pct = _row_percentages(cross_tab)
+    
+    long_pct = _long_percentages(cross_tab_pct)
+    fig = px.bar(long_pct, x=mh_col, y='pct', color=fc_col, text='pct')
+    fig.update_traces(texttemplate='%{text:.1f}%', textposition='inside')
+    
+    fig.update_layout(
+        title="Postpartum Depression vs Desire for More Children",
+        xaxis_title="Postpartum Depression Symptoms",
+        yaxis_title="Percentage",
+        barmode='stack',
+        height=500
+    )
+    
+    # Calculate statistics
+    if cross_tab.shape[0] > 1 and cross_tab.shape[1] > 1:
+        chi2, p_value = _chi2_test(cross_tab)
+    else:
+        chi2, p_value = None, None
+    
+    return {
+        'figure': fig,
+        'crosstab': cross_tab,
+        'crosstab_pct': cross_tab_pct.round(1),
+        'chi2': chi2,
+        'p_value': p_value,
+        'interpretation': _interpret_p_value(p_value) if p_value else "Insufficient data for statistical analysis"
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _support_vs_mental_health(df, support_col, anxiety_col):
+    """Analyze relationship between support systems and mental health"""
+    # Clean data
+    df_clean = df[[support_col, anxiety_col]].dropna()
+    
+    if len(df_clean) < 10:
+        return None
+    
+    # Create visualization
+    cross_tab = pd.crosstab(df_clean[support_col], df_clean[anxiety_col])
+    cross_tab_pct = _row_percentages(cross_tab)
+    
+    long_pct = _long_percentages(cross_tab_pct)
+    fig = px.bar(long_pct, x=support_col, y='pct', color=anxiety_col, text='pct')
+    fig.update_traces(texttemplate='%{text:.1f}%', textposition='inside')
+    
+    fig.update_layout(
+        title="Partner Support vs Anxiety During Birth",
+        xaxis_title="Partner Support Level",
+        yaxis_title="Percentage",
+        barmode='group',
+        height=500
+    )
+    
+    # Statistics
+    chi2, p_value = _chi2_test(cross_tab)
+    
+    return {
+        'figure': fig,
+        'crosstab': cross_tab,
+        'chi2': chi2,
+        'p_value': p_value,
+        'interpretation': _interpret_p_value(p_value)
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _chi2_matrix(df, cols):
+    """Pairwise chi-square p-values between the given columns"""
+    p_values = np.full((len(cols), len(cols)), np.nan)
+    for i, col_a in enumerate(cols):
+        for j in range(i + 1, len(cols)):
+            cross_tab = pd.crosstab(df[col_a], df[cols[j]])
+            if cross_tab.shape[0] > 1 and cross_tab.shape[1] > 1:
+                p_values[i, j] = p_values[j, i] = _chi2_test(cross_tab)[1]
+    return pd.DataFrame(p_values, index=list(cols), columns=list(cols))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4, ttl="1h")
+def get_analyzer(file_bytes, name):
+    """Parse the upload and build the analyzer once per distinct upload"""
+    return MaternityAnalyzer(_load_survey(file_bytes, name))
+
 
 class MaternityAnalyzer:
     def __init__(self, df):
         self.df = df
+        self._col_set = set(df.columns)
         self.key_questions = self._identify_key_questions()
     
+    @functools.cached_property
+    def _nunique(self):
+        """Unique answer count per column, computed once per analyzer"""
+        return self.df.nunique(dropna=True)
+    
+    @functools.cached_property
+    def _value_counts(self):
+        """Answer frequencies per column, computed once per analyzer"""
+        return {col: self.df[col].value_counts() for col in self.df.columns}
+    
     def _identify_key_questions(self):
         """Identify key question columns for analysis"""
-        questions = {}
-        
-        # Education
-        education_cols = [col for col in self.df.columns if 'obrazovan' in col.lower()]
-        questions['education'] = education_cols[0] if education_cols else None
-        
-        # Birth satisfaction
-        satisfaction_cols = [col for col in self.df.columns if 'iskustvo porođaja' in col.lower() and 'oceni' in col.lower()]
-        questions['birth_satisfaction'] = satisfaction_cols[0] if satisfaction_cols else None
-        
-        # Mental health indicators
-        questions['anxiety_during_birth'] = None
-        questions['postpartum_depression'] = None
-        questions['mental_health_support'] = None
+        questions = dict.fromkeys([
+            'education', 'birth_satisfaction', 'anxiety_during_birth', 'postpartum_depression',
+            'mental_health_support', 'future_children_desire', 'partner_support'
+        ])
         
+        # Single pass over the columns; headers without any key phrase are skipped by one regex search
         for col in self.df.columns:
-            if 'anksioznosti, straha' in col.lower() and 'porođaj' in col.lower():
+            if not _KEY_QUESTION_RE.search(col):
+                continue
+            lc = col.lower()
+            
+            # Education, birth satisfaction, future children and support: first match wins
+            if questions['education'] is None and 'obrazovan' in lc:
+                questions['education'] = col
+            if questions['birth_satisfaction'] is None and 'iskustvo porođaja' in lc and 'oceni' in lc:
+                questions['birth_satisfaction'] = col
+            if questions['future_children_desire'] is None and 'još dece' in lc and 'odluk' in lc:
+                questions['future_children_desire'] = col
+            if questions['partner_support'] is None and 'partner razume' in lc:
+                questions['partner_support'] = col
+            
+            # Mental health indicators: last match wins
+            if 'anksioznosti, straha' in lc and 'porođaj' in lc:
                 questions['anxiety_during_birth'] = col
-            elif 'postporođajne depresije' in col.lower() and 'simptome' in col.lower():
+            elif 'postporođajne depresije' in lc and 'simptome' in lc:
                 questions['postpartum_depression'] = col
-            elif 'emocijama i teškoćama' in col.lower() and 'sa kim' in col.lower():
+            elif 'emocijama i teškoćama' in lc and 'sa kim' in lc:
                 questions['mental_health_support'] = col
         
-        # Desire for more children
-        future_children_cols = [col for col in self.df.columns if 'još dece' in col.lower() and 'odluk' in col.lower()]
-        questions['future_children_desire'] = future_children_cols[0] if future_children_cols else None
-        
-        # Support system
-        partner_support_cols = [col for col in self.df.columns if 'partner razume' in col.lower()]
-        questions['partner_support'] = partner_support_cols[0] if partner_support_cols else None
-        
         return questions
     
     def analyze_education_vs_satisfaction(self):
@@ -92,31 +323,7 @@ class MaternityAnalyzer:
         edu_col = self.key_questions['education']
         sat_col = self.key_questions['birth_satisfaction']
         
-        # Create crosstab
-        cross_tab = pd.crosstab(self.df[edu_col], self.df[sat_col], margins=True)
-        cross_tab_pct = pd.crosstab(self.df[edu_col], self.df[sat_col], normalize='index') * 100
-        
-        # Create visualization
-        fig = px.imshow(
-            cross_tab_pct.values[:-1, :-1],  # Remove margins
-            x=cross_tab_pct.columns[:-1],
-            y=cross_tab_pct.index[:-1],
-            color_continuous_scale="RdYlBu_r",
-            title="Education Level vs Birth Satisfaction (% within education group)",
-            labels=dict(color="Percentage")
-        )
-        fig.update_layout(height=500)
-        
-        # Calculate statistics
-        chi2, p_value, dof, expected = chi2_contingency(cross_tab.iloc[:-1, :-1])
-        
-        return {
-            'figure': fig,
-            'crosstab': cross_tab,
-            'chi2': chi2,
-            'p_value': p_value,
-            'interpretation': self._interpret_p_value(p_value)
-        }
+        return _education_vs_satisfaction(self.df, edu_col, sat_col)
     
     def analyze_mental_health_vs_future_children(self):
         """Analyze relationship between mental health and desire for more children"""
@@ -126,48 +333,7 @@ class MaternityAnalyzer:
         mh_col = self.key_questions['postpartum_depression']
         fc_col = self.key_questions['future_children_desire']
         
-        # Clean and prepare data
-        df_clean = self.df[[mh_col, fc_col]].dropna()
-        
-        if len(df_clean) < 10:
-            return None
-        
-        # Create stacked bar chart
-        cross_tab = pd.crosstab(df_clean[mh_col], df_clean[fc_col])
-        cross_tab_pct = pd.crosstab(df_clean[mh_col], df_clean[fc_col], normalize='index') * 100
-        
-        fig = go.Figure()
-        
-        for col in cross_tab_pct.columns:
-            fig.add_trace(go.Bar(
-                name=col,
-                x=cross_tab_pct.index,
-                y=cross_tab_pct[col],
-                text=[f'{val:.1f}%' for val in cross_tab_pct[col]],
-                textposition='inside'
-            ))
-        
-        fig.update_layout(
-            title="Postpartum Depression vs Desire for More Children",
-            xaxis_title="Postpartum Depression Symptoms",
-            yaxis_title="Percentage",
-            barmode='stack',
-            height=500
-        )
-        
-        # Calculate statistics
-        if cross_tab.shape[0] > 1 and cross_tab.shape[1] > 1:
-            chi2, p_value, dof, expected = chi2_contingency(cross_tab)
-        else:
-            chi2, p_value = None, None
-        
-        return {
-            'figure': fig,
-            'crosstab': cross_tab,
-            'chi2': chi2,
-            'p_value': p_value,
-            'interpretation': self._interpret_p_value(p_value) if p_value else "Insufficient data for statistical analysis"
-        }
+        return _mental_health_vs_future_children(self.df, mh_col, fc_col)
     
     def analyze_support_vs_mental_health(self):
         """Analyze relationship between support systems and mental health"""
@@ -177,63 +343,19 @@ class MaternityAnalyzer:
         support_col = self.key_questions['partner_support']
         anxiety_col = self.key_questions['anxiety_during_birth']
         
-        # Clean data
-        df_clean = self.df[[support_col, anxiety_col]].dropna()
-        
-        if len(df_clean) < 10:
-            return None
-        
-        # Create visualization
-        cross_tab = pd.crosstab(df_clean[support_col], df_clean[anxiety_col])
-        cross_tab_pct = pd.crosstab(df_clean[support_col], df_clean[anxiety_col], normalize='index') * 100
-        
-        fig = go.Figure()
-        
-        for col in cross_tab_pct.columns:
-            fig.add_trace(go.Bar(
-                name=col,
-                x=cross_tab_pct.index,
-                y=cross_tab_pct[col],
-                text=[f'{val:.1f}%' for val in cross_tab_pct[col]],
-                textposition='inside'
-            ))
-        
-        fig.update_layout(
-            title="Partner Support vs Anxiety During Birth",
-            xaxis_title="Partner Support Level",
-            yaxis_title="Percentage",
-            barmode='group',
-            height=500
-        )
-        
-        # Statistics
-        chi2, p_value, dof, expected = chi2_contingency(cross_tab)
-        
-        return {
-            'figure': fig,
-            'crosstab': cross_tab,
-            'chi2': chi2,
-            'p_value': p_value,
-            'interpretation': self._interpret_p_value(p_value)
-        }
+        return _support_vs_mental_health(self.df, support_col, anxiety_col)
     
     def _interpret_p_value(self, p_value):
         """Interpret statistical significance"""
-        if p_value is None:
-            return "Cannot calculate statistical significance"
-        elif p_value < 0.001:
-            return "Very strong statistical relationship (p < 0.001)"
-        elif p_value < 0.01:
-            return "Strong statistical relationship (p < 0.01)"
-        elif p_value < 0.05:
-            return "Statistically significant relationship (p < 0.05)"
-        elif p_value < 0.1:
-            return "Marginally significant trend (p < 0.1)"
-        else:
-            return "No significant statistical relationship found"
+        return _interpret_p_value(p_value)
     
     def create_comprehensive_mental_health_analysis(self):
         """Create comprehensive mental health dashboard"""
+        return self._mental_health_charts
+    
+    @functools.cached_property
+    def _mental_health_charts(self):
+        """Mental health pie charts, built once per analyzer"""
         charts = []
         
         # Mental health questions analysis
@@ -244,8 +366,8 @@ class MaternityAnalyzer:
         ]
         
         for i, question in enumerate(mh_questions):
-            if question and question in self.df.columns:
-                values = self.df[question].value_counts()
+            if question and question in self._col_set:
+                values = self._value_counts[question]
                 
                 fig = px.pie(
                     values=values.values,
@@ -258,14 +380,19 @@ class MaternityAnalyzer:
     
     def create_demographics_analysis(self):
         """Enhanced demographics with correlations"""
+        return self._demographics_charts
+    
+    @functools.cached_property
+    def _demographics_charts(self):
+        """Demographic bar charts, built once per analyzer"""
         charts = []
         
         # Basic demographics
         demo_cols = self.df.columns[1:5]  # First few columns are usually demographics
         
-        for col in demo_cols:
-            if self.df[col].nunique() < 20:  # Only categorical data
-                values = self.df[col].value_counts()
+        for col, unique_count in self._nunique[demo_cols].items():
+            if unique_count < 20:  # Only categorical data
+                values = self._value_counts[col]
                 
                 fig = px.bar(
                     x=values.index,
@@ -295,12 +422,8 @@ def main():
         try:
             # Load data
             with st.spinner("Loading data..."):
-                if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file, encoding='utf-8')
-                else:
-                    df = pd.read_excel(uploaded_file)
-            
-            analyzer = MaternityAnalyzer(df)
+                analyzer = get_analyzer(uploaded_file.getvalue(), uploaded_file.name)
+            df = analyzer.df
             
             # Display key metrics
             col1, col2, col3, col4 = st.columns(4)
@@ -309,12 +432,12 @@ def main():
             with col2:
                 st.metric("❓ Questions", len(df.columns) - 1)
             with col3:
-                valid_responses = df.notna().sum().sum()
+                valid_responses = df.count().sum()
                 total_possible = len(df) * (len(df.columns) - 1)
                 completion_rate = (valid_responses / total_possible) * 100
                 st.metric("✅ Completion Rate", f"{completion_rate:.1f}%")
             with col4:
-                text_responses = sum(1 for col in df.columns if df[col].nunique() > 50)
+                text_responses = int((analyzer._nunique > 50).sum())
                 st.metric("📝 Open Questions", text_responses)
             
             # Main analysis tabs
@@ -349,7 +472,7 @@ def main():
                     
                     # Show detailed breakdown
                     st.subheader("📋 Detailed Breakdown")
-                    st.dataframe(analysis['crosstab'], use_container_width=True)
+                    _show_crosstab(analysis['crosstab'], use_container_width=True)
                 else:
                     st.warning("Cannot perform this analysis - missing required questions")
             
@@ -373,15 +496,13 @@ def main():
                         """, unsafe_allow_html=True)
                     
                     st.subheader("🧮 Cross-tabulation")
-                    st.dataframe(analysis['crosstab'], use_container_width=True)
+                    _show_crosstab(analysis['crosstab'], use_container_width=True)
                     
                     # Key insights
                     st.subheader("💡 Key Insights")
                     if analysis['crosstab'] is not None:
-                        total_with_depression = analysis['crosstab'].sum(axis=1)
-                        for idx in total_with_depression.index:
-                            pct_wanting_more = (analysis['crosstab'].loc[idx, :] / total_with_depression[idx] * 100).round(1)
-                            st.write(f"**{idx}:** Distribution across future children desire")
+                        st.write("**Distribution across future children desire (% of each group):**")
+                        st.dataframe(analysis['crosstab_pct'], use_container_width=True)
                 else:
                     st.warning("Cannot perform this analysis - missing required questions")
             
@@ -402,7 +523,7 @@ def main():
                     
                     with col2:
                         st.subheader("Cross-tabulation")
-                        st.dataframe(analysis['crosstab'])
+                        _show_crosstab(analysis['crosstab'])
                 else:
                     st.warning("Cannot perform this analysis - missing required questions")
             
@@ -413,9 +534,31 @@ def main():
                 st.subheader("🔗 Multiple Variable Relationships")
                 
                 # Available variables for analysis
-                available_vars = [q for q in analyzer.key_questions.values() if q and q in df.columns]
+                available_vars = [q for q in analyzer.key_questions.values() if q and q in analyzer._col_set]
                 
                 if len(available_vars) >= 2:
+                    # Pairwise significance overview, computed once per dataset
+                    matrix_vars = list(dict.fromkeys(available_vars))
+                    var_labels = {}
+                    for key, question in analyzer.key_questions.items():
+                        if question:
+                            var_labels.setdefault(question, key.replace('_', ' ').capitalize())
+                    labels = [var_labels[q] for q in matrix_vars]
+                    
+                    p_matrix = _chi2_matrix(df, tuple(matrix_vars))
+                    fig = px.imshow(
+                        p_matrix.values,
+                        x=labels,
+                        y=labels,
+                        zmin=0,
+                        zmax=1,
+                        color_continuous_scale="Viridis",
+                        title="Chi-square p-values between key questions (darker = stronger relationship)",
+                        labels=dict(color="P-value")
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    st.markdown("Pick two variables to see their full cross-tabulation:")
                     col1, col2 = st.columns(2)
                     with col1:
                         var1 = st.selectbox("Select first variable:", available_vars, key="rel1")
@@ -426,7 +569,7 @@ def main():
                         if var1 != var2:
                             # Create cross-tabulation
                             cross_tab = pd.crosstab(df[var1], df[var2])
-                            cross_tab_pct = pd.crosstab(df[var1], df[var2], normalize='index') * 100
+                            cross_tab_pct = _row_percentages(cross_tab)
                             
                             # Visualization
                             fig = px.imshow(
@@ -439,10 +582,10 @@ def main():
                             st.plotly_chart(fig, use_container_width=True)
                             
                             # Statistics
-                            chi2, p_value, dof, expected = chi2_contingency(cross_tab)
+                            chi2, p_value = _chi2_test(cross_tab)
                             st.write(f"**Statistical significance:** {analyzer._interpret_p_value(p_value)}")
                             
-                            st.dataframe(cross_tab, use_container_width=True)
+                            _show_crosstab(cross_tab, use_container_width=True)
                 else:
                     st.info("Not enough variables available for relationship analysis")
             
@@ -478,16 +621,27 @@ def main():
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    st.metric("Response Rate by Question", f"{(df.notna().mean().mean()*100):.1f}%")
+                    response_rate = valid_responses / df.size * 100 if df.size else float('nan')
+                    st.metric("Response Rate by Question", f"{response_rate:.1f}%")
                     
                     # Most common responses
                     if analyzer.key_questions['birth_satisfaction']:
-                        most_common_satisfaction = df[analyzer.key_questions['birth_satisfaction']].mode().iloc[0]
-                        st.write(f"**Most common birth satisfaction rating:** {most_common_satisfaction}")
+                        satisfaction_counts = analyzer._value_counts[analyzer.key_questions['birth_satisfaction']]
+                        # any() also skips categories that were never answered
+                        if satisfaction_counts.any():
+                            most_common_satisfaction = satisfaction_counts.idxmax()
+                            st.write(f"**Most common birth satisfaction rating:** {most_common_satisfaction}")
                 
                 with col2:
                     if analyzer.key_questions['postpartum_depression']:
-                        depression_rate = (df[analyzer.key_questions['postpartum_depression']].str.contains('Da', na=False).sum() / len(df) * 100)
+                        depression_col = df[analyzer.key_questions['postpartum_depression']]
+                        if isinstance(depression_col.dtype, pd.CategoricalDtype):
+                            # Match 'Da' against the few categories, then compare codes
+                            yes_answers = [c for c in depression_col.cat.categories if 'Da' in str(c)]
+                            reported = depression_col.isin(yes_answers)
+                        else:
+                            reported = depression_col.str.contains('Da', na=False)
+                        depression_rate = reported.sum() / len(df) * 100
                         st.metric("Reported Postpartum Depression", f"{depression_rate:.1f}%")
         
         except Exception as e:
@@ -0,0 +1,59 @@
+import functools
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+def _cache_path(path):
+    """Return the Parquet cache path if it is newer than the Excel file, else None"""
+    cache_path = os.path.splitext(path)[0] + '.parquet'
+    if os.path.exists(cache_path) and (
+        not os.path.exists(path) or os.path.getmtime(cache_path) >= os.path.getmtime(path)
+    ):
+        return cache_path
+    return None
+
+
+def survey_columns(path='jovana.xlsx'):
+    """Return the survey's column headers, from the Parquet schema alone when the cache is fresh"""
+    cache_path = _cache_path(path)
+    if cache_path:
+        return pd.Index(pq.read_schema(cache_path).names)
+    # A cache miss does the one full read; load_survey reuses that frame, or the cache it wrote
+    return _read_sheet(path, os.path.getmtime(path)).columns
+
+
+@functools.lru_cache(maxsize=1)
+def _read_sheet(path, mtime):
+    """Parse the whole Excel sheet and cache it as Parquet, reusing the frame within a run"""
+    # openpyxl parses every cell even with usecols, so always read and cache the whole sheet.
+    # Converting after the read keeps mixed-type columns (numbers and "Da"/"Ne") as object
+    # instead of failing the Arrow conversion inside read_excel.
+    df = pd.read_excel(path).convert_dtypes(dtype_backend='pyarrow')
+    cache_path = os.path.splitext(path)[0] + '.parquet'
+    try:
+        df.to_parquet(cache_path, engine='pyarrow', index=False)
+    except (TypeError, ValueError):
+        # Mixed-type columns can't be stored as Parquet; fall back to Excel every run
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+
+    return df
+
+
+def load_survey(path='jovana.xlsx', columns=None):
+    """Load survey data, caching the parsed Excel sheet as Parquet next to it"""
+    cache_path = _cache_path(path)
+    if cache_path:
+        return pd.read_parquet(cache_path, engine='pyarrow', columns=columns, dtype_backend='pyarrow')
+
+    # Without a usable Parquet cache, a second call in the same run reuses the parsed frame
+    df = _read_sheet(path, os.path.getmtime(path))
+    # Copy so callers can't modify the memoized frame
+    return df.copy() if columns is None else df[list(columns)]
+
+
+def first_distinct(values, k=5):
+    """Return the first k distinct non-null values as a plain list"""
+    return values.dropna().unique()[:k].tolist()